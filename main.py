@@ -1,21 +1,48 @@
 # main.py
 from pages.base_page import BasePage
-from utils.driver_utils import setup_driver
+from utils.driver_utils import setup_driver, release_driver
 from pages.category_page import CategoryPage
-import random
+from utils.sampling import SamplingPlanner
+from utils.result_cache import ResultCache
+import argparse
+import time
 
-def main():
+def main(
+    use_daemon=False,
+    max_tiles=30,
+    max_seconds=600,
+    target_half_width=0.15,
+    use_cache=True,
+    revalidate_fraction=0.1,
+    harvest_share=0.25,
+):
     """
     Main function to execute the property tile processing workflow.
+
+    Args:
+        use_daemon (bool): Attach to the warm daemon browser instead of
+            cold-starting Chrome.
+        max_tiles (int): Maximum number of tiles to process.
+        max_seconds (float): Maximum time spent harvesting and processing tiles.
+        target_half_width (float): Stop sampling once the mismatch rate is
+            known to within this margin.
+        use_cache (bool): Reuse verified map and details results of tiles
+            whose content has not changed since an earlier run.
+        revalidate_fraction (float): Share of cache hits still checked live.
+        harvest_share (float): Share of `max_seconds` the harvest may use, so
+            processing keeps most of the time budget.
     """
     driver = None
+    result_cache = (
+        ResultCache(revalidate_fraction=revalidate_fraction) if use_cache else None
+    )
 
     try:
         # Initialize driver with optimal settings
-        driver = setup_driver()
+        driver = setup_driver(use_daemon)
 
         # Initialize category page and navigate to valid URL
-        category_page = CategoryPage(driver)
+        category_page = CategoryPage(driver, result_cache)
         valid_url = category_page.navigate_to_valid_category_page()
         category_page.wait_for_map_to_load(5)
         base_page = BasePage(driver)
@@ -28,28 +55,98 @@ def main():
 
         # Load all tiles
         all_tiles = category_page.load_all_property_tiles(total_tiles)
-        random_tiles = random.sample(all_tiles, min(len(all_tiles), 10))
 
-        # Process tiles one by one
+        # Harvest the cheap tile data to plan a stratified sample. The time
+        # budget covers the harvest too, which may use only part of it.
+        started_at = time.monotonic()
+        harvested = category_page.harvest_tile_data(
+            all_tiles, deadline=started_at + max_seconds * harvest_share
+        )
+        planner = SamplingPlanner(
+            harvested,
+            target_half_width=target_half_width,
+            max_tiles=max_tiles,
+            max_seconds=max_seconds,
+            started_at=started_at,
+        )
+
+        # Process tiles one by one until the mismatch rate is known
         results = []
-        for tile in random_tiles:
+        for item in planner:
             try:
                 # Process the tile
-                result = category_page.process_tile(tile, valid_url)
+                result = category_page.process_tile(
+                    item["tile"],
+                    valid_url,
+                    tile_data=item["tile_data"],
+                    property_id=item["property_id"],
+                )
                 results.append(result)
+                if result["cached"]:
+                    planner.record_cached()
+                else:
+                    planner.record(not result["passed"])
             except Exception as e:
+                planner.record_error()
                 print(f"Error processing tile: {e}")
+        print(planner.summary())
     except KeyboardInterrupt:
         print("\nOperation interrupted by user")
 
     finally:
         if driver:
             try:
-                # Close all tabs/windows
-                driver.quit()
+                # Close all tabs/windows, keeping the daemon browser alive
+                release_driver(driver, use_daemon)
             except Exception:
                 pass
+        if result_cache is not None:
+            try:
+                result_cache.save()
+            except Exception as e:
+                print(f"Error saving result cache: {e}")
+            print(result_cache.summary())
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Attach to the warm browser daemon instead of starting Chrome",
+    )
+    parser.add_argument(
+        "--max-tiles", type=int, default=30, help="Maximum number of tiles to process"
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=600,
+        help="Maximum time spent harvesting and processing tiles",
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=0.15,
+        help="Stop once the mismatch rate is known to within this margin",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Check every tile live instead of reusing cached results",
+    )
+    parser.add_argument(
+        "--revalidate",
+        type=float,
+        default=0.1,
+        help="Share of cache hits that are still checked live",
+    )
+    args = parser.parse_args()
+    main(
+        use_daemon=args.daemon,
+        max_tiles=args.max_tiles,
+        max_seconds=args.max_seconds,
+        target_half_width=args.margin,
+        use_cache=not args.no_cache,
+        revalidate_fraction=args.revalidate,
+    )
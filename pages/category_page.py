@@ -14,9 +14,10 @@ from utils.utility_func import (
 import time
 
 class CategoryPage(BasePage):
-    def __init__(self, driver):
+    def __init__(self, driver, result_cache=None):
         super().__init__(driver)
         self.paths = xpaths_for_category()
+        self.result_cache = result_cache
 
     def navigate_to_valid_category_page(self, max_attempts=10):
         """
@@ -116,27 +117,97 @@ class CategoryPage(BasePage):
         except Exception as e:
             print(f"Error waiting for map section to load: {e}")
 
-    def process_tile(self, tile, url, wait_time=1):
+    def harvest_tile_data(self, tiles, deadline=None):
+        """
+        Extracts the tile data of every loaded tile, skipping (and reporting)
+        tiles that fail.
+        The implicit wait is switched off meanwhile, so probing for a rating
+        structure a tile does not have fails at once instead of after the
+        driver's implicit wait. Harvesting stops at `deadline` (a
+        time.monotonic() value) if one is given.
+        """
+        harvested = []
+        implicit_wait = self.driver.timeouts.implicit_wait
+        self.driver.implicitly_wait(0)
+        try:
+            for tile in tiles:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                try:
+                    tile_data, property_id, rating_variant = extract_property_info(
+                        tile, paths=self.paths, verbose=False
+                    )
+                except Exception as e:
+                    print(f"Skipping tile that could not be harvested: {e}")
+                    continue
+                harvested.append(
+                    {
+                        "tile": tile,
+                        "tile_data": tile_data,
+                        "property_id": property_id,
+                        "rating_variant": rating_variant,
+                    }
+                )
+        finally:
+            self.driver.implicitly_wait(implicit_wait)
+        return harvested
+
+    def process_tile(self, tile, url, wait_time=1, tile_data=None, property_id=None):
         """
         Processes a single tile, extracting data and generating a report.
+        Already harvested tile data can be passed in to skip re-extracting it.
         """
-        tile_data, property_id = extract_property_info(tile)
+        if tile_data is None:
+            tile_data, property_id, _ = extract_property_info(tile, paths=self.paths)
         if not tile_data:
             raise Exception("Failed to extract data from tile.")
 
-        # Extract map data
-        map_data = {}
-        if self.click_map_icon(tile):
-            self.wait_for_map_to_load()
-            time.sleep(1.5)
-            map_data = extract_map_info(self.driver, wait_time)
+        # Reuse verified results of an unchanged tile if the cache allows it
+        cached = None
+        if self.result_cache is not None:
+            cached = self.result_cache.lookup(property_id, tile_data)
+
+        if cached:
+            map_data = cached["map_data"]
+            hybrid_data = cached["hybrid_data"]
+        else:
+            started_at = time.monotonic()
+            try:
+                # Extract map data
+                map_data = {}
+                if self.click_map_icon(tile):
+                    self.wait_for_map_to_load()
+                    time.sleep(1.5)
+                    map_data = extract_map_info(self.driver, wait_time)
+
+                # Extract hybrid page data
+                hybrid_data = process_hybrid_page(self.driver, tile, wait_time)
+            except Exception:
+                # A live check that raises must not leave an old verified entry behind
+                if self.result_cache is not None:
+                    self.result_cache.invalidate(property_id, tile_data)
+                raise
+            elapsed = time.monotonic() - started_at
 
-        # Extract hybrid page data
-        hybrid_data = process_hybrid_page(self.driver, tile, wait_time)
         # Generate comparison report
-        generate_comparison_report(property_id,tile_data, map_data, hybrid_data, url)
+        passed = generate_comparison_report(
+            property_id,
+            tile_data,
+            map_data,
+            hybrid_data,
+            url,
+            test_case="Test for data consistency"
+            + (" (cached result)" if cached else ""),
+        )
+
+        if self.result_cache is not None and not cached:
+            self.result_cache.store(
+                property_id, tile_data, map_data, hybrid_data, passed, elapsed
+            )
 
         return {
+            "passed": passed,
+            "cached": bool(cached),
             "tile_data": tile_data,
             "map_data": map_data,
             "hybrid_data": hybrid_data,
@@ -0,0 +1,544 @@
+# utils/browser_daemon.py
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.driver_finder import DriverFinder
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DAEMON_DIR = os.path.join(os.path.expanduser("~"), ".autopageexplorer")
+PROFILE_DIR = os.path.join(DAEMON_DIR, "chrome-profile")
+STATE_FILE = os.path.join(DAEMON_DIR, "daemon.json")
+ACTIVITY_FILE = os.path.join(DAEMON_DIR, "activity")
+LEASE_FILE = os.path.join(DAEMON_DIR, "lease")
+LOG_FILE = os.path.join(DAEMON_DIR, "daemon.log")
+
+DEFAULT_PORT = 9322  # Not Chrome's usual 9222, to stay clear of a developer's own browser
+DEFAULT_IDLE_TIMEOUT = 900  # Seconds without a run before the browser shuts down
+HEALTH_CHECK_INTERVAL = 5
+MAX_FAILED_HEALTH_CHECKS = 3
+
+CHROME_CANDIDATES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+)
+
+
+def find_chrome_binary():
+    """
+    Locate the Chrome executable used by the daemon.
+
+    Returns:
+        str: Path to the Chrome binary. CHROME_BINARY overrides the lookup.
+
+    Raises:
+        Exception: If no Chrome binary can be found.
+    """
+    binary = os.environ.get("CHROME_BINARY")
+    if binary:
+        return binary
+
+    for candidate in CHROME_CANDIDATES:
+        path = shutil.which(candidate)
+        if path:
+            return path
+    raise Exception("Chrome binary not found. Set CHROME_BINARY to its path.")
+
+
+def debugger_address(port=DEFAULT_PORT):
+    """
+    Returns the host:port string chromedriver attaches to.
+    """
+    return f"127.0.0.1:{port}"
+
+
+def driver_url(port=DEFAULT_PORT):
+    """
+    Returns the URL of the daemon's chromedriver for the browser on `port`.
+    """
+    return f"http://127.0.0.1:{port + 1}"
+
+
+def _get_json(url, timeout=1):
+    """
+    Perform a GET and decode the JSON body.
+    """
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def _devtools_request(port, path, timeout=1):
+    """
+    Perform a GET against the DevTools HTTP endpoint and decode the JSON body.
+    """
+    return _get_json(f"http://{debugger_address(port)}{path}", timeout)
+
+
+def is_driver_healthy(port=DEFAULT_PORT, timeout=1):
+    """
+    Checks whether the daemon's chromedriver is ready to create sessions.
+    """
+    try:
+        return bool(_get_json(f"{driver_url(port)}/status", timeout)["value"]["ready"])
+    except Exception:
+        return False
+
+
+def is_browser_healthy(port=DEFAULT_PORT, timeout=1):
+    """
+    Checks whether the daemon browser answers on its DevTools endpoint.
+
+    Args:
+        port (int): Remote debugging port of the browser.
+        timeout (float): Maximum time to wait for the response.
+
+    Returns:
+        bool: True if the browser responded, False otherwise.
+    """
+    try:
+        _devtools_request(port, "/json/version", timeout)
+        return True
+    except Exception:
+        return False
+
+
+def owns_browser(port=DEFAULT_PORT):
+    """
+    Checks whether the browser answering on `port` is the daemon's own Chrome.
+    Chrome writes the port and browser endpoint of every launch into
+    DevToolsActivePort in its profile, so a browser using another profile
+    cannot match it.
+
+    Args:
+        port (int): Remote debugging port of the browser.
+
+    Returns:
+        bool: True if the daemon's supervisor and Chrome are serving `port`.
+    """
+    state = read_state()
+    if state.get("port") != port or not state.get("chrome_pid"):
+        return False
+
+    try:
+        with open(os.path.join(PROFILE_DIR, "DevToolsActivePort")) as f:
+            active_port, browser_path = f.read().split()[:2]
+        version = _devtools_request(port, "/json/version")
+    except Exception:
+        return False
+    return int(active_port) == port and version.get(
+        "webSocketDebuggerUrl", ""
+    ).endswith(browser_path)
+
+
+def read_state():
+    """
+    Reads the daemon state file.
+
+    Returns:
+        dict: The recorded state, or an empty dict if no daemon is running.
+    """
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_state(state):
+    """
+    Writes the daemon state file.
+    """
+    os.makedirs(DAEMON_DIR, exist_ok=True)
+    with open(STATE_FILE, "w") as f:
+        json.dump(state, f)
+
+
+def _remove_state():
+    """
+    Deletes the daemon state file if it still exists.
+    """
+    try:
+        os.remove(STATE_FILE)
+    except FileNotFoundError:
+        pass
+
+
+def log_tail(lines=10):
+    """
+    Returns the last lines of the daemon log, or an empty string.
+    """
+    try:
+        with open(LOG_FILE, errors="replace") as f:
+            return "".join(f.readlines()[-lines:]).strip()
+    except FileNotFoundError:
+        return ""
+
+
+def _startup_error(message):
+    """
+    Builds the exception raised when the daemon fails to start, with the end
+    of its log so the real cause is visible to the run.
+    """
+    tail = log_tail()
+    if tail:
+        message = f"{message} Last lines of {LOG_FILE}:\n{tail}"
+    return Exception(message)
+
+
+def touch_activity():
+    """
+    Marks the daemon as used now, postponing its idle shutdown.
+    """
+    os.makedirs(DAEMON_DIR, exist_ok=True)
+    with open(ACTIVITY_FILE, "a"):
+        os.utime(ACTIVITY_FILE, None)
+
+
+def seconds_since_activity():
+    """
+    Returns the number of seconds since the daemon was last used.
+    """
+    try:
+        return time.time() - os.path.getmtime(ACTIVITY_FILE)
+    except FileNotFoundError:
+        return 0
+
+
+def _try_lock(fd):
+    """
+    Take an exclusive lock on an open file without blocking.
+
+    Returns:
+        bool: True if the lock was taken, False if another process holds it.
+    """
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd):
+    """
+    Release a lock taken with `_try_lock`.
+    """
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def has_active_lease():
+    """
+    Checks whether a run currently holds the browser.
+    """
+    os.makedirs(DAEMON_DIR, exist_ok=True)
+    fd = os.open(LEASE_FILE, os.O_RDWR | os.O_CREAT)
+    try:
+        if not _try_lock(fd):
+            return True
+        _unlock(fd)
+        return False
+    finally:
+        os.close(fd)
+
+
+class BrowserLease:
+    """
+    Gives one run at a time the daemon browser through an exclusive lock on
+    the lease file. The OS drops the lock when the run's process exits, so a
+    run that dies never keeps holding the browser.
+    """
+
+    def __init__(self):
+        self._fd = None
+
+    def acquire(self, wait_timeout=600):
+        """
+        Wait until no other run holds the browser, then take the lease.
+
+        Args:
+            wait_timeout (float): Maximum time to wait for another run to finish.
+
+        Raises:
+            Exception: If the browser is still in use after `wait_timeout`.
+        """
+        os.makedirs(DAEMON_DIR, exist_ok=True)
+        fd = os.open(LEASE_FILE, os.O_RDWR | os.O_CREAT)
+        deadline = time.time() + wait_timeout
+        while not _try_lock(fd):
+            if time.time() > deadline:
+                os.close(fd)
+                raise Exception("Daemon browser is still in use by another run.")
+            time.sleep(0.2)
+
+        self._fd = fd
+        touch_activity()
+
+    def release(self):
+        """
+        Give the browser back to the daemon.
+        """
+        if self._fd is not None:
+            _unlock(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        touch_activity()
+
+
+def launch_chrome(port=DEFAULT_PORT):
+    """
+    Start Chrome with remote debugging enabled and a persistent profile, so
+    the HTTP cache survives between runs.
+
+    Returns:
+        subprocess.Popen: The Chrome process.
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    args = [
+        find_chrome_binary(),
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={PROFILE_DIR}",
+        "--start-maximized",  # Start with maximized window
+        "--disable-extensions",  # Disable extensions
+        "--disable-gpu",  # Disable GPU hardware acceleration
+        "--no-sandbox",  # Bypass OS security model
+        "--disable-dev-shm-usage",  # Overcome limited resource problems
+        "--no-first-run",
+        "--no-default-browser-check",
+        "about:blank",
+    ]
+    if os.environ.get("CHROME_HEADLESS"):
+        args.append("--headless=new")
+    with open(LOG_FILE, "a") as log:
+        return subprocess.Popen(args, stdout=log, stderr=subprocess.STDOUT)
+
+
+def launch_chromedriver(port=DEFAULT_PORT):
+    """
+    Start the chromedriver that runs attach through, so they skip starting a
+    chromedriver and resolving it with Selenium Manager every time.
+
+    Returns:
+        Service: The running chromedriver service.
+    """
+    service = Service(port=port + 1, log_output=LOG_FILE)
+    service.path = DriverFinder(service, Options()).get_driver_path()
+    service.start()
+    return service
+
+
+def _terminate(process, timeout=5):
+    """
+    Terminate a child process, killing it if it does not exit in time.
+    """
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def serve(port=DEFAULT_PORT, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """
+    Supervisor loop of the daemon. Keeps a warm Chrome running, restarts it
+    when it stops answering health checks and shuts it down once no run has
+    held a lease on it for `idle_timeout` seconds.
+
+    Args:
+        port (int): Remote debugging port of the browser.
+        idle_timeout (int): Idle seconds before the daemon exits.
+    """
+    chrome = None
+    chromedriver = None
+    stopping = []
+
+    def handle_stop(signum, frame):
+        stopping.append(signum)
+
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+
+    touch_activity()
+    failed_checks = 0
+    try:
+        while not stopping:
+            restarted = False
+            if chromedriver is None or not is_driver_healthy(port):
+                if chromedriver is not None:
+                    print("Daemon chromedriver is not responding, restarting it.")
+                    chromedriver.stop()
+                chromedriver = launch_chromedriver(port)
+                restarted = True
+
+            if chrome is None or chrome.poll() is not None:
+                chrome = launch_chrome(port)
+                failed_checks = 0
+                restarted = True
+
+            if restarted:
+                write_state(
+                    {
+                        "pid": os.getpid(),
+                        "chrome_pid": chrome.pid,
+                        "chromedriver_pid": chromedriver.process.pid,
+                        "port": port,
+                    }
+                )
+
+            if is_browser_healthy(port, timeout=HEALTH_CHECK_INTERVAL):
+                failed_checks = 0
+            else:
+                failed_checks += 1
+                if failed_checks >= MAX_FAILED_HEALTH_CHECKS:
+                    print("Daemon browser is not responding, restarting it.")
+                    _terminate(chrome)
+                    chrome = None
+                    continue
+
+            if not has_active_lease() and seconds_since_activity() > idle_timeout:
+                break
+
+            time.sleep(HEALTH_CHECK_INTERVAL)
+    finally:
+        _terminate(chrome)
+        if chromedriver is not None:
+            chromedriver.stop()
+        if read_state().get("pid") == os.getpid():
+            _remove_state()
+
+
+def start_browser_daemon(
+    port=DEFAULT_PORT, idle_timeout=DEFAULT_IDLE_TIMEOUT, startup_timeout=30
+):
+    """
+    Make sure a daemon browser and its chromedriver are running, spawning the
+    supervisor in the background if needed.
+
+    Args:
+        port (int): Remote debugging port of the browser.
+        idle_timeout (int): Idle seconds before the daemon exits.
+        startup_timeout (int): Maximum time to wait for the browser to come up.
+
+    Returns:
+        tuple: The browser's debugger address and the chromedriver URL.
+
+    Raises:
+        Exception: If another browser already listens on `port`, or the daemon
+            browser does not come up in time.
+    """
+    touch_activity()
+    if owns_browser(port) and is_driver_healthy(port):
+        return debugger_address(port), driver_url(port)
+
+    # A supervisor whose browser is wedged is replaced, not reused
+    stop_browser_daemon()
+    if is_browser_healthy(port):
+        raise Exception(
+            f"Port {port} is used by a browser the daemon does not own. "
+            "Pick another port."
+        )
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.makedirs(DAEMON_DIR, exist_ok=True)
+    with open(LOG_FILE, "w") as log:
+        supervisor = subprocess.Popen(
+            [
+                sys.executable,
+                "-u",
+                "-m",
+                "utils.browser_daemon",
+                "serve",
+                "--port",
+                str(port),
+                "--idle-timeout",
+                str(idle_timeout),
+            ],
+            cwd=project_root,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline:
+        if owns_browser(port) and is_driver_healthy(port):
+            return debugger_address(port), driver_url(port)
+        if supervisor.poll() is not None:
+            raise _startup_error("Browser daemon exited during startup.")
+        time.sleep(0.2)
+    raise _startup_error(f"Daemon browser did not start on port {port}.")
+
+
+def stop_browser_daemon(timeout=10):
+    """
+    Stop the running daemon, if any, and wait for it to exit.
+    """
+    state = read_state()
+    pid = state.get("pid")
+    if not pid:
+        return
+
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        pass
+
+    deadline = time.time() + timeout
+    while time.time() < deadline and read_state().get("pid") == pid:
+        time.sleep(0.2)
+
+    # The supervisor is gone or stuck; make sure its browser goes with it
+    if read_state().get("pid") == pid:
+        for child in ("chrome_pid", "chromedriver_pid"):
+            if state.get(child):
+                try:
+                    os.kill(state[child], signal.SIGTERM)
+                except OSError:
+                    pass
+        _remove_state()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the warm browser daemon.")
+    parser.add_argument("command", choices=["start", "stop", "status", "serve"])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle-timeout", type=int, default=DEFAULT_IDLE_TIMEOUT)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.port, args.idle_timeout)
+    elif args.command == "start":
+        address, url = start_browser_daemon(args.port, args.idle_timeout)
+        print(f"Daemon browser listening on {address}, chromedriver on {url}")
+    elif args.command == "stop":
+        stop_browser_daemon()
+    else:
+        status = "running" if owns_browser(args.port) else "not running"
+        print(f"Daemon browser is {status} on port {args.port}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,30 @@
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from utils.browser_daemon import (
+    DEFAULT_PORT,
+    BrowserLease,
+    start_browser_daemon,
+    stop_browser_daemon,
+)
 
 
-def setup_driver():
+def setup_driver(use_daemon=False, port=DEFAULT_PORT):
     """
     Set up and configure the Chrome WebDriver with optimal settings.
 
+    Args:
+        use_daemon (bool): Attach to the warm daemon browser instead of
+            starting a new Chrome.
+        port (int): Remote debugging port of the daemon browser.
+
     Returns:
         webdriver: Configured Chrome WebDriver instance
     """
+    if use_daemon:
+        return attach_to_daemon(port)
+
     chrome_options = Options()
     chrome_options.add_argument("--start-maximized")  # Start with maximized window
     chrome_options.add_argument("--disable-extensions")  # Disable extensions
@@ -23,3 +38,99 @@ def setup_driver():
     driver = webdriver.Chrome(options=chrome_options)
     driver.implicitly_wait(10)
     return driver
+
+
+def attach_to_daemon(port=DEFAULT_PORT, clear_state=True):
+    """
+    Attach a WebDriver session to the daemon browser, starting the daemon if
+    it is not running. Runs take the browser one at a time, so a second run
+    waits for the first to release it. A daemon that cannot be attached to is
+    restarted once.
+
+    Args:
+        port (int): Remote debugging port of the daemon browser.
+        clear_state (bool): Clear cookies so the run starts logged out. The
+            HTTP cache is kept.
+
+    Returns:
+        webdriver: WebDriver instance attached to the daemon browser. Its
+        `daemon_lease` is given back by `release_driver`.
+    """
+    lease = BrowserLease()
+    lease.acquire()
+    try:
+        driver = _attach_with_restart(port, clear_state)
+    except Exception:
+        lease.release()
+        raise
+
+    driver.daemon_lease = lease
+    driver.implicitly_wait(10)
+    return driver
+
+
+def _attach_with_restart(port, clear_state):
+    """
+    Attach to the daemon browser, restarting the daemon once if that fails.
+    """
+    for attempt in range(2):
+        address, url = start_browser_daemon(port)
+        chrome_options = Options()
+        chrome_options.add_experimental_option("debuggerAddress", address)
+        driver = None
+        try:
+            driver = webdriver.Remote(
+                command_executor=ChromeRemoteConnection(url), options=chrome_options
+            )
+            reset_browser_context(driver, clear_state)
+            return driver
+        except Exception as e:
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            if attempt:
+                raise
+            print(f"Unable to attach to daemon browser, restarting it: {e}")
+            stop_browser_daemon()
+
+
+def reset_browser_context(driver, clear_state=True):
+    """
+    Give the run a fresh tab and close whatever previous runs left open.
+    Only the lease holder calls this, so no other run's tab is closed.
+    """
+    driver.switch_to.new_window("tab")
+    fresh_tab = driver.current_window_handle
+    for handle in driver.window_handles:
+        if handle != fresh_tab:
+            driver.switch_to.window(handle)
+            driver.close()
+    driver.switch_to.window(fresh_tab)
+
+    if clear_state:
+        # Remote has no execute_cdp_cmd, but its Chrome connection knows the command
+        driver.execute(
+            "executeCdpCommand", {"cmd": "Network.clearBrowserCookies", "params": {}}
+        )
+
+
+def release_driver(driver, use_daemon=False):
+    """
+    Finish a run. A daemon-attached session closes its extra tabs, parks the
+    last one on about:blank and gives its lease back, leaving the browser
+    running for the next run.
+    """
+    try:
+        if use_daemon:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get("about:blank")
+    finally:
+        if use_daemon:
+            driver.daemon_lease.release()
+        driver.quit()
@@ -0,0 +1,155 @@
+# utils/result_cache.py
+
+import hashlib
+import json
+import os
+import random
+import time
+from collections import OrderedDict
+
+CACHE_FILE = os.path.join("data", "result_cache.json")
+HASHED_FIELDS = ("title", "property_type", "rating", "number_of_reviews", "price")
+
+
+def tile_content_hash(tile_data):
+    """
+    Hashes the tile fields that the map and details page are compared against.
+
+    Args:
+        tile_data (dict): Property information extracted from the tile.
+
+    Returns:
+        str: Hex digest of the tile content.
+    """
+    content = json.dumps([tile_data.get(field) for field in HASHED_FIELDS])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent, LRU-bounded cache of verified map and details-page results,
+    keyed by property ID and tile content hash.
+    """
+
+    def __init__(
+        self,
+        path=CACHE_FILE,
+        max_entries=5000,
+        max_age=7 * 24 * 3600,
+        revalidate_fraction=0.1,
+    ):
+        """
+        Args:
+            path (str): JSON file the cache is persisted to.
+            max_entries (int): Least recently used entries beyond this are evicted.
+            max_age (float): Entries older than this many seconds are ignored.
+            revalidate_fraction (float): Share of hits that are still checked live.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.revalidate_fraction = revalidate_fraction
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.saved_seconds = 0.0
+        self.entries = self._load()
+
+    def _load(self):
+        """
+        Loads the cache file, starting empty if it is missing or unreadable.
+        """
+        try:
+            with open(self.path) as f:
+                return OrderedDict(json.load(f))
+        except (FileNotFoundError, ValueError):
+            return OrderedDict()
+
+    def save(self):
+        """
+        Writes the cache to disk.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _key(property_id, tile_data):
+        return f"{property_id}:{tile_content_hash(tile_data)}"
+
+    def lookup(self, property_id, tile_data):
+        """
+        Look up the verified results of an unchanged tile.
+
+        Args:
+            property_id (str): ID of the property.
+            tile_data (dict): Property information extracted from the tile.
+
+        Returns:
+            dict: The cached entry, or None on a miss or when the hit was
+            picked for live revalidation.
+        """
+        key = self._key(property_id, tile_data)
+        entry = self.entries.get(key)
+        if entry is None or time.time() - entry["verified_at"] > self.max_age:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        if random.random() < self.revalidate_fraction:
+            self.revalidations += 1
+            return None
+
+        self.hits += 1
+        self.saved_seconds += entry["seconds"]
+        return entry
+
+    def store(self, property_id, tile_data, map_data, hybrid_data, passed, seconds):
+        """
+        Store a live result. Only fully verified results are cached; a failed
+        check drops any earlier entry for the same tile content.
+
+        Args:
+            property_id (str): ID of the property.
+            tile_data (dict): Property information extracted from the tile.
+            map_data (dict): Data from the map info window.
+            hybrid_data (dict): Data from the details page.
+            passed (bool): Whether all three sources agreed.
+            seconds (float): Browser time the live check took.
+        """
+        if not passed:
+            self.invalidate(property_id, tile_data)
+            return
+
+        key = self._key(property_id, tile_data)
+        self.entries[key] = {
+            "map_data": map_data,
+            "hybrid_data": hybrid_data,
+            "verified_at": time.time(),
+            "seconds": seconds,
+        }
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, property_id, tile_data):
+        """
+        Drop the entry of a tile whose live check failed or raised.
+
+        Args:
+            property_id (str): ID of the property.
+            tile_data (dict): Property information extracted from the tile.
+        """
+        self.entries.pop(self._key(property_id, tile_data), None)
+
+    def summary(self):
+        """
+        Returns a one-line description of the cache usage in this run.
+        """
+        return (
+            f"Result cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.revalidations} revalidated live, "
+            f"{self.saved_seconds:.1f}s of browser time saved"
+        )
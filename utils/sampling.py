@@ -0,0 +1,191 @@
+# utils/sampling.py
+
+import math
+import random
+import time
+from collections import defaultdict
+from statistics import NormalDist
+
+
+def tile_stratum(item):
+    """
+    Returns the stratum a harvested tile belongs to, built from its property
+    type and the rating structure it shows. Star-rated and review-scored
+    tiles go through different extraction branches, so they are kept apart.
+
+    Args:
+        item (dict): Harvested tile with its tile_data and rating_variant.
+
+    Returns:
+        tuple: (property_type, rating_variant)
+    """
+    return item["tile_data"].get("property_type", ""), item["rating_variant"]
+
+
+def wilson_interval(mismatches, samples, confidence=0.95):
+    """
+    Wilson score interval for a proportion.
+
+    Args:
+        mismatches (int): Number of mismatching tiles.
+        samples (int): Number of processed tiles.
+        confidence (float): Confidence level of the interval.
+
+    Returns:
+        tuple: (low, high) bounds of the mismatch rate.
+    """
+    if samples == 0:
+        return 0.0, 1.0
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = mismatches / samples
+    denominator = 1 + z * z / samples
+    center = (rate + z * z / (2 * samples)) / denominator
+    half_width = (
+        z
+        * math.sqrt(rate * (1 - rate) / samples + z * z / (4 * samples * samples))
+        / denominator
+    )
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+class SamplingPlanner:
+    """
+    Orders tiles by proportional stratified sampling and stops once the
+    mismatch rate is known precisely enough or a budget runs out.
+
+    Iterating the planner yields the items to process; the caller reports
+    each outcome with `record`.
+    """
+
+    def __init__(
+        self,
+        items,
+        stratum=tile_stratum,
+        target_half_width=0.15,
+        confidence=0.95,
+        min_tiles=5,
+        max_tiles=30,
+        max_seconds=600,
+        started_at=None,
+    ):
+        """
+        Args:
+            items (list): Harvested tiles to sample from.
+            stratum (callable): Returns the stratum key of an item.
+            target_half_width (float): Stop once the confidence interval is
+                at most this wide on each side.
+            confidence (float): Confidence level of the interval.
+            min_tiles (int): Never stop before this many tiles checked live.
+            max_tiles (int): Budget of tiles checked live, counting tiles that
+                failed to process. Tiles reused from the result cache are free.
+            max_seconds (float): Time budget, counted from `started_at`.
+            started_at (float): time.monotonic() value the time budget starts
+                at, so harvesting the tiles can count towards it. Defaults to
+                the first item.
+        """
+        self.target_half_width = target_half_width
+        self.confidence = confidence
+        self.min_tiles = min_tiles
+        self.max_tiles = max_tiles
+        self.max_seconds = max_seconds
+        self.samples = 0
+        self.mismatches = 0
+        self.cached = 0
+        self.errors = 0
+        self.stop_reason = None
+        self.started_at = started_at
+        self.order = self._stratified_order(items, stratum)
+
+    @staticmethod
+    def _stratified_order(items, stratum):
+        """
+        Shuffle each stratum, then interleave them so that every prefix of the
+        order is close to proportional to the stratum sizes.
+        """
+        strata = defaultdict(list)
+        for item in items:
+            strata[stratum(item)].append(item)
+        for members in strata.values():
+            random.shuffle(members)
+
+        total = len(items)
+        taken = {key: 0 for key in strata}
+        order = []
+        for position in range(1, total + 1):
+            # Pick the stratum furthest behind its proportional share
+            key = max(
+                (key for key in strata if taken[key] < len(strata[key])),
+                key=lambda key: len(strata[key]) * position / total - taken[key],
+            )
+            order.append(strata[key][taken[key]])
+            taken[key] += 1
+        return order
+
+    def record(self, mismatch):
+        """
+        Record the outcome of a tile checked live.
+
+        Args:
+            mismatch (bool): True if the sources disagreed for the tile.
+        """
+        self.samples += 1
+        self.mismatches += int(mismatch)
+
+    def record_cached(self):
+        """
+        Record a tile whose results came from the result cache. Only passing
+        results are cached, so these say nothing new about the mismatch rate;
+        they cost no browser time and do not use up the tile budget.
+        """
+        self.cached += 1
+
+    def record_error(self):
+        """
+        Record a tile that failed to process. It uses up the tile budget but
+        says nothing about the mismatch rate.
+        """
+        self.errors += 1
+
+    def interval(self):
+        """
+        Returns the current confidence interval of the mismatch rate.
+        """
+        return wilson_interval(self.mismatches, self.samples, self.confidence)
+
+    def should_stop(self):
+        """
+        Checks the stopping rules and remembers which one fired.
+        """
+        if self.samples + self.errors >= self.max_tiles:
+            self.stop_reason = "tile budget reached"
+        elif time.monotonic() - self.started_at >= self.max_seconds:
+            self.stop_reason = "time budget reached"
+        elif self.samples >= self.min_tiles:
+            low, high = self.interval()
+            if (high - low) / 2 <= self.target_half_width:
+                self.stop_reason = "mismatch rate known"
+        return self.stop_reason is not None
+
+    def __iter__(self):
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        for item in self.order:
+            if self.should_stop():
+                return
+            yield item
+        self.stop_reason = "all tiles processed"
+
+    def summary(self):
+        """
+        Returns a one-line description of the sampling outcome.
+        """
+        low, high = self.interval()
+        rate = self.mismatches / self.samples if self.samples else 0.0
+        return (
+            f"Checked {self.samples} of {len(self.order)} tiles live "
+            f"({self.cached} reused from cache, {self.errors} failed to process), "
+            f"mismatch rate among live-checked tiles {rate:.1%} "
+            f"({self.confidence:.0%} CI {low:.1%}-{high:.1%}), "
+            f"stopped: {self.stop_reason}"
+        )
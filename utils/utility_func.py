@@ -54,23 +54,28 @@ def is_category_page(driver):
         print(f"Error while checking ScriptData.pageLayout: {e}")
         return False
 
-def extract_property_info(tile, wait_time=1.5):
+def extract_property_info(tile, wait_time=1.5, paths=None, verbose=True):
     """
     Extracts property information and the data-id from a tile element.
 
     Args:
         tile (WebElement): The tile element.
         wait_time (float): Maximum time to wait for elements to load.
+        paths (Series): Category XPaths, loaded from the Excel file if omitted.
+        verbose (bool): Print extraction errors before re-raising them.
 
     Returns:
         tuple: A tuple containing:
             - dict: A dictionary with the property information from the tile.
             - str: The property_id extracted from the data-id attribute.
+            - str: Which rating structure the tile shows: "review", "star",
+              "new" or "none".
 
     Raises:
         Exception: If any required element is missing.
     """
-    paths = xpaths_for_category()  # Function must return a dictionary of XPath mappings
+    if paths is None:
+        paths = xpaths_for_category()  # Function must return a dictionary of XPath mappings
     info = {}
     wait = WebDriverWait(tile, wait_time)
 
@@ -97,6 +102,7 @@ def extract_property_info(tile, wait_time=1.5):
 
         # Handle dynamic rating and review structures
         if rating_review_div.find_elements(By.XPATH, paths["review_general"]):
+            rating_variant = "review"
             info["rating"] = rating_review_div.find_element(
                 By.XPATH, paths["review_general"]
             ).text
@@ -105,6 +111,7 @@ def extract_property_info(tile, wait_time=1.5):
             ).text
 
         elif rating_review_div.find_elements(By.XPATH, paths["star_ratings"]):
+            rating_variant = "star"
             star_rating = rating_review_div.find_element(
                 By.XPATH, paths["star_ratings"]
             ).get_attribute("class")
@@ -114,12 +121,14 @@ def extract_property_info(tile, wait_time=1.5):
             ).text
 
         elif rating_review_div.find_elements(By.XPATH, paths["number_of_reviews"]):
+            rating_variant = "new"
             info["rating"] = "New"
             info["number_of_reviews"] = rating_review_div.find_element(
                 By.XPATH, paths["number_of_reviews"]
             ).text
 
         else:
+            rating_variant = "none"
             info["rating"] = "N/A"
             info["number_of_reviews"] = "N/A"
 
@@ -130,9 +139,10 @@ def extract_property_info(tile, wait_time=1.5):
         info["price"] = price_text.split(" ", 1)[1] if " " in price_text else price_text
 
     except Exception as e:
-        print(f"Error extracting property info from tile: {e}")
+        if verbose:
+            print(f"Error extracting property info from tile: {e}")
         raise
-    return info, property_id
+    return info, property_id, rating_variant
 
 def extract_map_info(driver, wait_time=5):
     """
@@ -224,7 +234,8 @@ def generate_comparison_report(
         hybrid_data (dict): Data from the details page.
 
     Returns:
-        None. Saves an Excel report in the `data` folder with `test_reports.xlsx` as the file name.
+        bool: Whether the three sources agree. Saves an Excel report in the `data` folder
+        with `test_reports.xlsx` as the file name.
     """
 
     # Ensure the 'data' directory exists
@@ -268,6 +279,8 @@ def generate_comparison_report(
     # Save updated report
     df.to_excel(output_file, index=False)
 
+    return passed
+
 
 def xpaths_for_category():
     """